@@ -1,8 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import codecs
+import math
 import os
 
+from datafiles import SOURCE_HASH_KEY, file_sha256
+
 # Set page config
 st.set_page_config(page_title="Startup Investments Dashboard", layout="wide")
 
@@ -14,62 +22,106 @@ Use the filters below to explore the data interactively.
 """)
 
 # Load data
-@st.cache_data
-def load_data():
+DATA_CSV = "investments_VC.csv"
+DATA_PARQUET = "investments_VC.parquet"
+# Columns the charts and filters actually read; everything else stays on disk and out of the cache
+DASHBOARD_COLUMNS = ['name', 'funding_total_usd', 'market', 'country_code', 'status', 'region']
+
+def clean_str(series, lower=False):
+    # Fill, trim and optionally lowercase in a single Arrow pipeline instead of chained .str calls
+    values = pc.utf8_trim_whitespace(pa.array(series.fillna('Unknown').astype(str)))
+    if lower:
+        values = pc.utf8_lower(values)
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=series.index)
+
+def parse_funding(series):
+    # Strip "$", "," and whitespace and cast to float in Arrow; placeholders like " -   " become NaN
+    cleaned = pc.replace_substring_regex(pa.array(series.astype(str)), r'[\$,\s]', '')
+    numeric = pc.if_else(pc.match_substring_regex(cleaned, r'^[0-9]+(\.[0-9]*)?$'), cleaned, None)
+    return pd.Series(pc.cast(numeric, pa.float64()).to_numpy(zero_copy_only=False), index=series.index)
+
+def clean_data(df):
+    # Data cleaning (expects funding_total_usd to already be numeric)
+    # One combined mask and a single slice; NaN funding fails the > 0 test, so it doubles as dropna
+    mask = df['funding_total_usd'].to_numpy() > 0
+    mask &= df['name'].notna().to_numpy() & df['market'].notna().to_numpy()
+    df = df[mask]
+    # Standardize market
+    df['market'] = clean_str(df['market'], lower=True)
+    # Clean country_code and status
+    df['country_code'] = clean_str(df['country_code'])
+    df['status'] = clean_str(df['status'])
+    # Categorical codes make isin/groupby/value_counts work on small integers instead of strings
+    for col in ('market', 'country_code', 'status', 'region'):
+        df[col] = df[col].astype('category')
+    # Dropped rows leave gaps in the index; a RangeIndex costs nothing to cache or pickle
+    return df.reset_index(drop=True)
+
+@st.cache_data(max_entries=1)
+def parquet_matches_csv(parquet_mtime, csv_mtime):
+    # scripts/convert.py stamps the CSV's hash into the Parquet metadata. Comparing hashes rather than
+    # mtimes stays correct after a git checkout, which rewrites both timestamps in arbitrary order;
+    # the mtimes are only the cache key, so the CSV is hashed again only when either file changes.
+    recorded = (pq.read_schema(DATA_PARQUET).metadata or {}).get(SOURCE_HASH_KEY)
+    return recorded == file_sha256(DATA_CSV).encode()
+
+def data_source():
+    # Prefer the Parquet file unless the CSV has been replaced since it was converted
+    if not os.path.exists(DATA_PARQUET):
+        return DATA_CSV
+    if not os.path.exists(DATA_CSV) or parquet_matches_csv(os.path.getmtime(DATA_PARQUET), os.path.getmtime(DATA_CSV)):
+        return DATA_PARQUET
+    st.warning(f"{DATA_PARQUET} is out of date with {DATA_CSV}; loading the CSV instead. "
+               "Run `python scripts/convert.py` to regenerate it.")
+    return DATA_CSV
+
+@st.cache_data(persist="disk", max_entries=1, show_spinner="Loading Crunchbase data…")
+def load_data(path, mtime):
+    # path and mtime are the cache key: a new CSV or a re-run of scripts/convert.py invalidates the
+    # disk entry. Errors are raised rather than returned so a failed load is never persisted.
+    if path == DATA_PARQUET:
+        # Fast path: typed, column-pruned read of the file written by scripts/convert.py
+        df = pq.read_table(path, columns=DASHBOARD_COLUMNS).to_pandas()
+        return clean_data(df)
+
+    # Pick the encoding from the first 64 KiB instead of re-parsing the whole file per attempt
+    with open(path, 'rb') as f:
+        head = f.read(65536)
     try:
-        # Check if file exists
-        if not os.path.exists("investments_VC.csv"):
-            raise FileNotFoundError("investments_VC.csv not found in the project directory.")
-
-        # Try loading with different encodings
-        encodings = ['utf-8', 'latin1', 'iso-8859-1']
-        for encoding in encodings:
-            try:
-                df = pd.read_csv("investments_VC.csv", encoding=encoding)
-                # Strip spaces from column names
-                df.columns = df.columns.str.strip()
-                # Verify required columns
-                required_columns = ['name', 'funding_total_usd', 'market', 'country_code', 'status']
-                missing_columns = [col for col in required_columns if col not in df.columns]
-                if missing_columns:
-                    raise ValueError(f"Missing required columns: {missing_columns}")
-
-                # Data cleaning
-                df = df.dropna(subset=['name', 'funding_total_usd', 'market'])
-                df['funding_total_usd'] = pd.to_numeric(df['funding_total_usd'].replace('[\$,]', '', regex=True), errors='coerce')
-                df = df[df['funding_total_usd'] > 0]
-                # Standardize market and category_list
-                df['market'] = df['market'].str.strip().str.lower()
-                df['category_list'] = df['category_list'].fillna('').str.split('|').apply(lambda x: [i.strip().lower() for i in x if i])
-                # Clean country_code and status
-                df['country_code'] = df['country_code'].fillna('Unknown').astype(str).str.strip()
-                df['status'] = df['status'].fillna('Unknown').astype(str).str.strip()
-                return df
-            except UnicodeDecodeError:
-                continue
-
-        # Fallback: load with error handling
-        df = pd.read_csv("investments_VC.csv", encoding='latin1', errors='ignore')
-        df.columns = df.columns.str.strip()
-        required_columns = ['name', 'funding_total_usd', 'market', 'country_code', 'status']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
-
-        df = df.dropna(subset=['name', 'funding_total_usd', 'market'])
-        df['funding_total_usd'] = pd.to_numeric(df['funding_total_usd'].replace('[\$,]', '', regex=True), errors='coerce')
-        df = df[df['funding_total_usd'] > 0]
-        df['market'] = df['market'].str.strip().str.lower()
-        df['category_list'] = df['category_list'].fillna('').str.split('|').apply(lambda x: [i.strip().lower() for i in x if i])
-        df['country_code'] = df['country_code'].fillna('Unknown').astype(str).str.strip()
-        df['status'] = df['status'].fillna('Unknown').astype(str).str.strip()
-        return df
-
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
-
-df = load_data()
+        # Incremental decode so a multi-byte character cut off at the window edge is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        encoding = 'utf-8'
+    except UnicodeDecodeError:
+        encoding = 'latin1'
+
+    # Parse only the dashboard columns, all as text, so pandas skips dtype inference
+    read_options = dict(usecols=lambda col: col.strip() in DASHBOARD_COLUMNS, dtype=str)
+    try:
+        df = pd.read_csv(path, encoding=encoding, **read_options)
+    except UnicodeDecodeError:
+        # Non-UTF-8 bytes past the probe window; latin1 decodes any byte sequence
+        df = pd.read_csv(path, encoding='latin1', **read_options)
+    # Strip spaces from column names
+    df.columns = df.columns.str.strip()
+    # Verify required columns
+    required_columns = ['name', 'funding_total_usd', 'market', 'country_code', 'status']
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+    df['funding_total_usd'] = parse_funding(df['funding_total_usd'])
+    return clean_data(df)
+
+try:
+    data_path = data_source()
+    # Check if file exists
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"{DATA_CSV} not found in the project directory.")
+    data_mtime = os.path.getmtime(data_path)
+    df = load_data(data_path, data_mtime)
+except Exception as e:
+    st.error(f"Error loading data: {str(e)}")
+    df = pd.DataFrame()
 
 if df.empty:
     st.markdown("""
@@ -93,83 +145,173 @@ if df.empty:
     st.stop()
 
 # Sidebar filters
+@st.cache_data(max_entries=1)
+def sidebar_choices(data_path, data_mtime):
+    # Widget options depend only on the loaded data, so sort them once rather than on every rerun;
+    # keyed like load_data so a replaced data file rebuilds them from the new frame
+    return {
+        'markets': sorted(df['market'].dropna().unique().tolist()),
+        'default_markets': df['market'].dropna().unique()[:3].tolist(),
+        'countries': sorted(df['country_code'].dropna().unique().tolist()),
+        'statuses': sorted(df['status'].dropna().unique().tolist()),
+        'min_funding': float(df['funding_total_usd'].min()),
+        'max_funding': float(df['funding_total_usd'].max()),
+    }
+
+def query_selection(name, options, fallback):
+    # Restore a selection saved in the URL, dropping values that are no longer valid options
+    valid = set(options)
+    return [value for value in st.query_params.get_all(name) if value in valid] or fallback
+
+def query_range(name, lo, hi, fallback):
+    try:
+        saved_lo, saved_hi = (float(value) for value in st.query_params.get_all(name))
+    except ValueError:
+        return fallback
+    # Clamp to the slider bounds first; out-of-range, inverted or non-finite (NaN/inf) ranges fall back
+    clamped_lo, clamped_hi = max(lo, saved_lo), min(hi, saved_hi)
+    if not (math.isfinite(saved_lo) and math.isfinite(saved_hi) and lo <= clamped_lo <= clamped_hi <= hi):
+        return fallback
+    return (clamped_lo, clamped_hi)
+
+choices = sidebar_choices(data_path, data_mtime)
+min_funding = choices['min_funding']
+max_funding = choices['max_funding']
+
+# Filters start from the last selection kept in the URL, so reloads and shared links hit the aggregate cache
 st.sidebar.header("Filters")
-markets = st.sidebar.multiselect("Select Markets", options=sorted(df['market'].unique()), default=df['market'].unique()[:3])
-countries = st.sidebar.multiselect("Select Countries", options=sorted(df['country_code'].unique()), default=['USA', 'CHN', 'GBR'])
-min_funding = float(df['funding_total_usd'].min())
-max_funding = float(df['funding_total_usd'].max())
-funding_range = st.sidebar.slider("Select Funding Range (USD)", min_funding, max_funding, (min_funding, max_funding/10))
-statuses = st.sidebar.multiselect("Select Status", options=sorted(df['status'].unique()), default=df['status'].unique())
-
-# Filter data
-filtered_df = df[
-    (df['market'].isin(markets)) &
-    (df['country_code'].isin(countries)) &
-    (df['funding_total_usd'].between(funding_range[0], funding_range[1])) &
-    (df['status'].isin(statuses))
-]
+markets = st.sidebar.multiselect("Select Markets", options=choices['markets'], key='markets',
+                                 default=query_selection('m', choices['markets'], choices['default_markets']))
+countries = st.sidebar.multiselect("Select Countries", options=choices['countries'], key='countries',
+                                   default=query_selection('c', choices['countries'], ['USA', 'CHN', 'GBR']))
+funding_range = st.sidebar.slider("Select Funding Range (USD)", min_funding, max_funding, key='funding_range',
+                                  value=query_range('f', min_funding, max_funding, (min_funding, max_funding/10)))
+statuses = st.sidebar.multiselect("Select Status", options=choices['statuses'], key='statuses',
+                                  default=query_selection('s', choices['statuses'], choices['statuses']))
+st.query_params.update(m=markets, c=countries, f=[str(v) for v in funding_range], s=statuses)
+
+# Filter data and aggregate once per filter combination
+def category_mask(series, selected):
+    # Match integer category codes against the few selected categories instead of hashing strings
+    selected_codes = np.flatnonzero(series.cat.categories.isin(selected))
+    return np.isin(series.cat.codes.to_numpy(), selected_codes)
+
+@st.cache_data(max_entries=32)
+def compute_aggregates(data_path, data_mtime, markets, countries, funding_lo, funding_hi, statuses):
+    # data_path/data_mtime tie the entries to the loaded frame (cache_data does not hash the global df)
+    # Build one boolean mask in place, starting from the funding range
+    funding = df['funding_total_usd'].to_numpy()
+    mask = (funding >= funding_lo) & (funding <= funding_hi)
+    mask &= category_mask(df['market'], markets)
+    mask &= category_mask(df['country_code'], countries)
+    mask &= category_mask(df['status'], statuses)
+    filtered_df = df[mask]
+
+    # Fuse aggregations that share a grouping key into a single groupby pass
+    market_stats = filtered_df.groupby('market', sort=False, observed=True)['funding_total_usd'].agg(['sum', 'mean'])
+    status_stats = filtered_df.groupby('status', observed=True)['funding_total_usd'].agg(['sum', 'count'])
+    return {
+        'market_funding': market_stats['sum'].nlargest(10),
+        'country_counts': filtered_df.groupby('country_code', sort=False, observed=True).size().nlargest(10),
+        'status_funding': status_stats['sum'],
+        'region_funding': filtered_df.groupby('region', sort=False, observed=True)['funding_total_usd'].sum().nlargest(10),
+        'top_startups': filtered_df.groupby('name', sort=False)['funding_total_usd'].sum().nlargest(10),
+        'market_dist': market_stats['sum'].nlargest(10),
+        'avg_market_funding': market_stats['mean'].nlargest(10),
+        'status_counts': status_stats['count'].sort_values(ascending=False),
+    }
+
+aggregates = compute_aggregates(data_path, data_mtime, tuple(markets), tuple(countries), funding_range[0], funding_range[1], tuple(statuses))
+
+# Figure builders. Numeric traces are sent as float32 arrays, which Plotly encodes as compact base64
+# instead of decimal text. A fixed uirevision lets the browser keep zoom/selection state when a chart's data changes.
+def build_bar_figure(x, y, title, xaxis_title, yaxis_title, orientation='v'):
+    if orientation == 'h':
+        x = np.asarray(x, dtype=np.float32)
+    else:
+        y = np.asarray(y, dtype=np.float32)
+    fig = go.Figure(go.Bar(x=x, y=y, orientation=orientation))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title, uirevision='keep')
+    return fig
+
+def build_pie_figure(values, labels, title):
+    fig = go.Figure(go.Pie(values=np.asarray(values, dtype=np.float32), labels=labels))
+    fig.update_layout(title=title, uirevision='keep')
+    return fig
+
+# Charts: one render function per insight, fed from the cached aggregates
+def render_market_funding(market_funding):
+    st.subheader("Top Markets by Total Funding")
+    fig1 = build_bar_figure(market_funding.to_numpy(), market_funding.index.tolist(), "Top Markets by Funding", "Total Funding (USD)", "Market", orientation='h')
+    st.plotly_chart(fig1, use_container_width=True, key="market_funding_bar")
+
+def render_country_counts(country_counts):
+    st.subheader("Top Countries by Number of Startups")
+    fig2 = build_pie_figure(country_counts.to_numpy(), country_counts.index.tolist(), "Top Countries")
+    st.plotly_chart(fig2, use_container_width=True, key="country_counts_pie")
+
+def render_status_funding(status_funding):
+    st.subheader("Funding by Startup Status")
+    fig3 = build_bar_figure(status_funding.index.tolist(), status_funding.to_numpy(), "Total Funding by Status", "Status", "Total Funding (USD)")
+    st.plotly_chart(fig3, use_container_width=True, key="status_funding_bar")
+
+def render_region_funding(region_funding):
+    st.subheader("Top Regions by Funding")
+    fig4 = build_bar_figure(region_funding.index.tolist(), region_funding.to_numpy(), "Top Regions by Funding", "Region", "Total Funding (USD)")
+    st.plotly_chart(fig4, use_container_width=True, key="region_funding_bar")
+
+def render_top_startups(top_startups):
+    st.subheader("Most Funded Startups")
+    fig5 = build_bar_figure(top_startups.index.tolist(), top_startups.to_numpy(), "Top Funded Startups", "Startup", "Total Funding (USD)")
+    st.plotly_chart(fig5, use_container_width=True, key="top_startups_bar")
+
+def render_market_dist(market_dist):
+    st.subheader("Funding Distribution by Market")
+    fig6 = build_pie_figure(market_dist.to_numpy(), market_dist.index.tolist(), "Funding Distribution by Market")
+    st.plotly_chart(fig6, use_container_width=True, key="market_dist_pie")
+
+def render_avg_market_funding(avg_market_funding):
+    st.subheader("Average Funding by Market")
+    fig7 = build_bar_figure(avg_market_funding.index.tolist(), avg_market_funding.to_numpy(), "Top Markets by Average Funding", "Market", "Average Funding (USD)")
+    st.plotly_chart(fig7, use_container_width=True, key="avg_market_funding_bar")
+
+def render_status_counts(status_counts):
+    st.subheader("Startup Status Breakdown")
+    fig8 = build_pie_figure(status_counts.to_numpy(), status_counts.index.tolist(), "Status Distribution")
+    st.plotly_chart(fig8, use_container_width=True, key="status_counts_pie")
 
 # Layout
 col1, col2 = st.columns(2)
 
 # Insight 1: Top Markets by Funding
 with col1:
-    st.subheader("Top Markets by Total Funding")
-    market_funding = filtered_df.groupby('market')['funding_total_usd'].sum().sort_values(ascending=False).head(10)
-    fig1 = px.bar(x=market_funding.values, y=market_funding.index, orientation='h', title="Top Markets by Funding")
-    fig1.update_layout(xaxis_title="Total Funding (USD)", yaxis_title="Market")
-    st.plotly_chart(fig1, use_container_width=True)
+    render_market_funding(aggregates['market_funding'])
 
 # Insight 2: Top Countries by Number of Startups
 with col2:
-    st.subheader("Top Countries by Number of Startups")
-    country_counts = filtered_df['country_code'].value_counts().head(10)
-    fig2 = px.pie(values=country_counts.values, names=country_counts.index, title="Top Countries")
-    st.plotly_chart(fig2, use_container_width=True)
+    render_country_counts(aggregates['country_counts'])
 
 # Insight 3: Funding by Status
-st.subheader("Funding by Startup Status")
-status_funding = filtered_df.groupby('status')['funding_total_usd'].sum()
-fig3 = px.bar(x=status_funding.index, y=status_funding.values, title="Total Funding by Status")
-fig3.update_layout(xaxis_title="Status", yaxis_title="Total Funding (USD)")
-st.plotly_chart(fig3, use_container_width=True)
+render_status_funding(aggregates['status_funding'])
 
 # Insight 4: Top Regions by Funding
 with col1:
-    st.subheader("Top Regions by Funding")
-    region_funding = filtered_df.groupby('region')['funding_total_usd'].sum().sort_values(ascending=False).head(10)
-    fig4 = px.bar(x=region_funding.index, y=region_funding.values, title="Top Regions by Funding")
-    fig4.update_layout(xaxis_title="Region", yaxis_title="Total Funding (USD)")
-    st.plotly_chart(fig4, use_container_width=True)
+    render_region_funding(aggregates['region_funding'])
 
 # Insight 5: Most Funded Startups
 with col2:
-    st.subheader("Most Funded Startups")
-    top_startups = filtered_df.groupby('name')['funding_total_usd'].sum().sort_values(ascending=False).head(10)
-    fig5 = px.bar(x=top_startups.index, y=top_startups.values, title="Top Funded Startups")
-    fig5.update_layout(xaxis_title="Startup", yaxis_title="Total Funding (USD)")
-    st.plotly_chart(fig5, use_container_width=True)
+    render_top_startups(aggregates['top_startups'])
 
 # Insight 6: Funding by Market
-st.subheader("Funding Distribution by Market")
-market_dist = filtered_df.groupby('market')['funding_total_usd'].sum().sort_values(ascending=False).head(10)
-fig6 = px.pie(values=market_dist.values, names=market_dist.index, title="Funding Distribution by Market")
-st.plotly_chart(fig6, use_container_width=True)
+render_market_dist(aggregates['market_dist'])
 
 # Insight 7: Average Funding by Market
 with col1:
-    st.subheader("Average Funding by Market")
-    avg_market_funding = filtered_df.groupby('market')['funding_total_usd'].mean().sort_values(ascending=False).head(10)
-    fig7 = px.bar(x=avg_market_funding.index, y=avg_market_funding.values, title="Top Markets by Average Funding")
-    fig7.update_layout(xaxis_title="Market", yaxis_title="Average Funding (USD)")
-    st.plotly_chart(fig7, use_container_width=True)
+    render_avg_market_funding(aggregates['avg_market_funding'])
 
 # Insight 8: Status Breakdown
 with col2:
-    st.subheader("Startup Status Breakdown")
-    status_counts = filtered_df['status'].value_counts()
-    fig8 = px.pie(values=status_counts.values, names=status_counts.index, title="Status Distribution")
-    st.plotly_chart(fig8, use_container_width=True)
+    render_status_counts(aggregates['status_counts'])
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,13 @@
+"""Helpers shared by app.py and scripts/convert.py for tying the Parquet file to its source CSV."""
+import hashlib
+
+# Parquet schema metadata key holding the SHA-256 of the CSV the file was converted from
+SOURCE_HASH_KEY = b'source_sha256'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
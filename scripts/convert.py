@@ -0,0 +1,53 @@
+"""One-time conversion of investments_VC.csv to a Snappy-compressed Parquet file.
+
+Run from anywhere inside the project:
+
+    python scripts/convert.py
+
+The SHA-256 of the source CSV is stored in the Parquet schema metadata. The
+dashboard only reads investments_VC.parquet while that hash still matches
+investments_VC.csv and falls back to the CSV otherwise, so re-run this script
+(and commit the new Parquet file alongside the CSV) whenever the CSV changes.
+"""
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PATH = os.path.join(PROJECT_DIR, "investments_VC.csv")
+PARQUET_PATH = os.path.join(PROJECT_DIR, "investments_VC.parquet")
+DATE_COLUMNS = ['founded_at', 'first_funding_at', 'last_funding_at']
+
+sys.path.insert(0, PROJECT_DIR)
+from datafiles import SOURCE_HASH_KEY, file_sha256  # noqa: E402
+
+
+def main():
+    df = pd.read_csv(CSV_PATH, encoding='latin1')
+    df.columns = df.columns.str.strip()
+
+    # Store funding as a number so the dashboard never has to strip "$" and "," again
+    df['funding_total_usd'] = pd.to_numeric(
+        df['funding_total_usd'].str.replace(r'[\$,]', '', regex=True), errors='coerce'
+    ).astype('float64')
+    # Crunchbase dates are mostly DD-MM-YYYY (e.g. 30-06-2012), but pre-1900 founding dates
+    # are written YYYY-MM-DD. Explicit formats skip per-row format inference, and cache=True
+    # parses each distinct date once. Anything matching neither format becomes NaT.
+    for col in DATE_COLUMNS:
+        parsed = pd.to_datetime(df[col], format='%d-%m-%Y', errors='coerce', cache=True)
+        parsed = parsed.fillna(pd.to_datetime(df[col], format='%Y-%m-%d', errors='coerce', cache=True))
+        # Mistyped years such as 0026-11-14 parse as ISO dates but are junk
+        df[col] = parsed.where(parsed.dt.year >= 1000)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**table.schema.metadata, SOURCE_HASH_KEY: file_sha256(CSV_PATH).encode()}
+    table = table.replace_schema_metadata(metadata)
+    pq.write_table(table, PARQUET_PATH, compression='snappy', row_group_size=100_000)
+    print(f"Wrote {len(df)} rows to {PARQUET_PATH}")
+
+
+if __name__ == "__main__":
+    main()